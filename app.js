@@ -25,6 +25,7 @@ let popupLocation = null;
 let locationSelectedAt = null;
 let timerInterval = null;
 let isBackgroundSyncRunning = false;
+let lastCommittedAt = null;
 
 const showServeInput = document.getElementById("showServe");
 const showNoServeInput = document.getElementById("showNoServe");
@@ -668,6 +669,17 @@ function createMosquePayloadFromPopup() {
   return formData;
 }
 
+function rememberCommittedAt(response) {
+  const committedAt = response.headers.get("X-Committed-At");
+  if (!committedAt) {
+    return;
+  }
+
+  if (!lastCommittedAt || Date.parse(committedAt) > Date.parse(lastCommittedAt)) {
+    lastCommittedAt = committedAt;
+  }
+}
+
 async function loadMosquesFromApi() {
   const selectedDate = calendarDateInput.value.trim();
   const q = searchTextInput.value.trim();
@@ -685,8 +697,16 @@ async function loadMosquesFromApi() {
     params.set("q", q);
   }
 
+  const headers = {};
+  if (lastCommittedAt) {
+    // Lets a read replica hand this read to the primary until its snapshot
+    // includes our own latest write.
+    headers["X-Min-Committed-At"] = lastCommittedAt;
+  }
+
   const response = await fetch(`${apiBase}?${params.toString()}`, {
     cache: "no-store",
+    headers,
   });
   if (!response.ok) {
     let message = `Failed to fetch mosque list (${response.status})`;
@@ -752,6 +772,7 @@ async function saveMosqueToApi(formData) {
     throw new Error(message);
   }
 
+  rememberCommittedAt(response);
   return response.json();
 }
 
@@ -778,6 +799,7 @@ async function verifyMosqueEntry(entryId) {
     throw new Error(message);
   }
 
+  rememberCommittedAt(response);
   return response.json();
 }
 
@@ -804,6 +826,7 @@ async function disagreeMosqueEntry(entryId) {
     throw new Error(message);
   }
 
+  rememberCommittedAt(response);
   return response.json();
 }
 
@@ -1,17 +1,39 @@
+import http.client
 import os
 import sqlite3
+import sys
 import time
+import urllib.error
+import urllib.parse
+import urllib.request
 import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from werkzeug.utils import secure_filename
 
 BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "mosques.db"
+DB_PATH = Path(os.environ.get("MOSQUES_DB_PATH", str(BASE_DIR / "mosques.db")))
 UPLOAD_DIR = BASE_DIR / "uploads"
 
+# Read-replica mode. The primary owns mosques.db; `python app.py publish-snapshots`
+# copies it into SNAPSHOT_DIR every SNAPSHOT_INTERVAL_SECONDS. Replicas serve
+# reads from that copy and forward every write to PRIMARY_URL.
+APP_ROLE = os.environ.get("APP_ROLE", "primary").strip().lower()
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", "").strip()
+SNAPSHOT_PATH = Path(SNAPSHOT_DIR) / "mosques.snapshot.db" if SNAPSHOT_DIR else None
+SNAPSHOT_INTERVAL_SECONDS = float(os.environ.get("SNAPSHOT_INTERVAL_SECONDS", "2"))
+PRIMARY_URL = os.environ.get("PRIMARY_URL", "").strip().rstrip("/")
+IS_REPLICA = APP_ROLE == "replica"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+if APP_ROLE not in {"primary", "replica"}:
+    raise RuntimeError(f"Invalid APP_ROLE {APP_ROLE!r}, expected 'primary' or 'replica'")
+
+if IS_REPLICA and SNAPSHOT_PATH is None:
+    raise RuntimeError("APP_ROLE=replica requires SNAPSHOT_DIR")
+
 ALLOWED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
 
 app = Flask(__name__, static_folder=str(BASE_DIR), static_url_path="")
@@ -30,6 +52,152 @@ def get_db_connection() -> sqlite3.Connection:
     return connection
 
 
+def get_snapshot_connection() -> tuple[sqlite3.Connection, str]:
+    # Stat before connecting: if a newer snapshot is swapped in between, the
+    # timestamp understates freshness instead of overstating it.
+    try:
+        mtime = SNAPSHOT_PATH.stat().st_mtime
+    except OSError as error:
+        raise sqlite3.OperationalError("snapshot not available") from error
+
+    # Snapshots are never modified in place (a new one is renamed over the old),
+    # so immutable=1 lets SQLite skip file locking entirely.
+    connection = sqlite3.connect(f"{SNAPSHOT_PATH.as_uri()}?mode=ro&immutable=1", uri=True)
+    connection.row_factory = sqlite3.Row
+    return connection, datetime.fromtimestamp(mtime, timezone.utc).isoformat()
+
+
+def get_read_connection() -> tuple[sqlite3.Connection, str | None]:
+    if IS_REPLICA:
+        return get_snapshot_connection()
+    return get_db_connection(), None
+
+
+def fsync_path(path: Path, directory: bool = False) -> None:
+    flags = os.O_RDONLY
+    if directory:
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        flags |= os.O_DIRECTORY
+
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def publish_snapshot(source: sqlite3.Connection) -> None:
+    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = SNAPSHOT_PATH.with_name(f".{SNAPSHOT_PATH.name}.{uuid.uuid4().hex}.tmp")
+
+    try:
+        target = sqlite3.connect(temp_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+
+        # Replicas open the published file with immutable=1, so it must be
+        # complete on disk before it takes the published name.
+        fsync_path(temp_path)
+        os.replace(temp_path, SNAPSHOT_PATH)
+        fsync_path(SNAPSHOT_PATH.parent, directory=True)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def run_snapshot_publisher() -> None:
+    if IS_REPLICA:
+        raise SystemExit("publish-snapshots must run with APP_ROLE=primary")
+
+    if SNAPSHOT_PATH is None:
+        raise SystemExit("publish-snapshots requires SNAPSHOT_DIR")
+
+    source = get_db_connection()
+    last_version = None
+
+    while True:
+        # Taken before data_version is read, so every commit up to this moment
+        # is in the snapshot and its mtime never overstates freshness.
+        captured_at = time.time()
+
+        try:
+            safe_cleanup_expired_data(source)
+            source.commit()
+
+            # data_version moves on commits from other connections, total_changes
+            # on this connection's own cleanup deletes.
+            version = (
+                source.execute("PRAGMA data_version").fetchone()[0],
+                source.total_changes,
+            )
+
+            if version != last_version or not SNAPSHOT_PATH.is_file():
+                publish_snapshot(source)
+                last_version = version
+
+            # Unchanged snapshots are still current as of captured_at, so the
+            # mtime (X-Snapshot-Published-At) moves forward without a rewrite.
+            os.utime(SNAPSHOT_PATH, (captured_at, captured_at))
+        except (sqlite3.Error, OSError) as error:
+            app.logger.warning("Snapshot publish failed: %s", error)
+
+        time.sleep(SNAPSHOT_INTERVAL_SECONDS)
+
+
+def forward_to_primary() -> Response:
+    url = f"{PRIMARY_URL}{urllib.parse.quote(request.path)}"
+    if request.query_string:
+        url += f"?{request.query_string.decode('latin-1')}"
+
+    headers = {
+        name: value
+        for name, value in request.headers.items()
+        if name.lower() in {"content-type", "x-client-id", "accept"}
+    }
+
+    forwarded = urllib.request.Request(
+        url, data=request.get_data(), headers=headers, method=request.method
+    )
+
+    # HTTPError is itself an OSError, so a truncated error body raised from
+    # error.read() falls through to the outer handler as well.
+    try:
+        try:
+            with urllib.request.urlopen(forwarded, timeout=30) as upstream:
+                status_code = upstream.status
+                body = upstream.read()
+                content_type = upstream.headers.get("Content-Type")
+                committed_at = upstream.headers.get("X-Committed-At")
+        except urllib.error.HTTPError as error:
+            status_code = error.code
+            body = error.read()
+            content_type = error.headers.get("Content-Type")
+            committed_at = None
+    except (OSError, http.client.HTTPException) as error:
+        app.logger.warning("Forwarding to primary failed: %s", error)
+        return jsonify({"message": "Primary server unavailable"}), 502
+
+    response = Response(body, status=status_code, content_type=content_type or "application/json")
+    if committed_at:
+        response.headers["X-Committed-At"] = committed_at
+    return response
+
+
+def snapshot_is_older_than(marker: str | None) -> bool:
+    committed_at = parse_iso_datetime(marker)
+    if committed_at is None:
+        return False
+
+    try:
+        mtime = SNAPSHOT_PATH.stat().st_mtime
+    except OSError:
+        return True
+
+    return datetime.fromtimestamp(mtime, timezone.utc) < committed_at
+
+
 def ensure_database() -> None:
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -435,13 +603,54 @@ def parse_mosque_payload() -> tuple[dict | None, int, str]:
     return payload, 200, "ok"
 
 
-ensure_database_with_retry()
+if IS_REPLICA:
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+    if not PRIMARY_URL:
+        app.logger.warning("APP_ROLE=replica without PRIMARY_URL, writes will be rejected")
+else:
+    ensure_database_with_retry()
+
+
+@app.before_request
+def forward_replica_requests():
+    if not IS_REPLICA or not request.path.startswith("/api/"):
+        return None
+
+    if request.method in WRITE_METHODS:
+        if not PRIMARY_URL:
+            return jsonify({"message": "Replica has no primary configured"}), 503
+        return forward_to_primary()
+
+    # Read-your-writes: a client that has just written sends back the
+    # X-Committed-At it got, and is served by the primary until the local
+    # snapshot has caught up to it.
+    if (
+        PRIMARY_URL
+        and request.method in {"GET", "HEAD"}
+        and snapshot_is_older_than(request.headers.get("X-Min-Committed-At"))
+    ):
+        return forward_to_primary()
+
+    return None
+
+
+@app.after_request
+def stamp_committed_writes(response):
+    if (
+        not IS_REPLICA
+        and request.method in WRITE_METHODS
+        and request.path.startswith("/api/")
+        and response.status_code < 400
+    ):
+        response.headers["X-Committed-At"] = now_iso()
+    return response
 
 
 @app.route("/api/mosques", methods=["GET", "POST"])
 @app.route("/api/mosques/", methods=["GET", "POST"])
 def mosques_route():
-    if request.method == "GET":
+    if request.method in {"GET", "HEAD"}:
         selected_date = request.args.get("date", "").strip()
         query_text = request.args.get("q", "").strip().lower()
         quick_food = request.args.get("quickFood", "all").strip().lower()
@@ -452,8 +661,10 @@ def mosques_route():
             quick_food = "all"
 
         try:
-            with get_db_connection() as connection:
-                safe_cleanup_expired_data(connection)
+            connection, published_at = get_read_connection()
+            with connection:
+                if not IS_REPLICA:
+                    safe_cleanup_expired_data(connection)
 
                 sql = """
                     SELECT id, name, lat, lng, food_type, prayer_slot, verify_count, disagree_count, created_at, updated_at,
@@ -480,10 +691,16 @@ def mosques_route():
                 rows = connection.execute(sql, params).fetchall()
                 connection.commit()
         except sqlite3.Error as error:
+            if IS_REPLICA:
+                app.logger.warning("Replica read failed: %s", error)
+                return jsonify({"message": "Replica snapshot not available yet"}), 503
             app.logger.exception("Database read failed: %s", error)
             return jsonify({"message": "Database read failed"}), 500
 
-        return jsonify([row_to_api_dict(row) for row in rows])
+        response = jsonify([row_to_api_dict(row) for row in rows])
+        if published_at:
+            response.headers["X-Snapshot-Published-At"] = published_at
+        return response
 
     parsed_payload, status_code, error_message = parse_mosque_payload()
     if parsed_payload is None:
@@ -662,5 +879,8 @@ application = app
 
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", "3000"))
-    app.run(host="0.0.0.0", port=port, debug=False)
+    if sys.argv[1:] == ["publish-snapshots"]:
+        run_snapshot_publisher()
+    else:
+        port = int(os.environ.get("PORT", "3000"))
+        app.run(host="0.0.0.0", port=port, debug=False)
@@ -0,0 +1,208 @@
+"""Run a primary and N read replicas locally and measure replica lag and read throughput.
+
+Usage:
+    python bench_replicas.py --max-replicas 4 --duration 5 --clients 16 --server-workers 2
+
+Every server is a separate gunicorn with --server-workers sync workers on its
+own port, plus one `python app.py publish-snapshots`. Load comes from --clients
+separate processes, so the total client concurrency is the same for every row.
+The first row is the primary serving reads alone.
+The database and snapshot directory live in a temporary folder, so the real
+mosques.db is untouched.
+
+All servers and all clients share this host's CPUs. Once they are saturated,
+adding replicas cannot raise reads/sec, so flat rows on a small machine show the
+host's limit, not the replicas'. To see real scaling, run the replicas on
+separate machines, or give the host more cores than clients plus workers in use.
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import uuid
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def start_process(command: list[str], env_overrides: dict) -> subprocess.Popen:
+    env = os.environ.copy()
+    env.update(env_overrides)
+    return subprocess.Popen(
+        command,
+        cwd=BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def start_server(port: int, workers: int, env_overrides: dict) -> subprocess.Popen:
+    return start_process(
+        [
+            sys.executable, "-m", "gunicorn",
+            "--workers", str(workers),
+            "--bind", f"127.0.0.1:{port}",
+            "app:application",
+        ],
+        env_overrides,
+    )
+
+
+def start_publisher(env_overrides: dict) -> subprocess.Popen:
+    return start_process([sys.executable, str(BASE_DIR / "app.py"), "publish-snapshots"], env_overrides)
+
+
+def http_json(url: str, data: dict | None = None) -> tuple[int, object]:
+    body = json.dumps(data).encode("utf-8") if data is not None else None
+    req = urllib.request.Request(
+        url,
+        data=body,
+        headers={"Content-Type": "application/json"},
+        method="POST" if data is not None else "GET",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return response.status, json.loads(response.read() or b"null")
+    except urllib.error.HTTPError as error:
+        return error.code, None
+    except (OSError, http.client.HTTPException, ValueError):
+        # Connection refused/reset, timeouts and truncated bodies all count as
+        # a failed request rather than aborting the benchmark.
+        return 0, None
+
+
+def wait_until_ready(base_url: str, timeout_seconds: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        status_code, _ = http_json(f"{base_url}/api/mosques")
+        if status_code == 200:
+            return
+        time.sleep(0.1)
+    raise RuntimeError(f"{base_url} did not become ready")
+
+
+def measure_lag(write_url: str, replica_urls: list[str], timeout_seconds: float = 30.0) -> list[float]:
+    status_code, entry = http_json(
+        f"{write_url}/api/mosques",
+        {"name": f"bench-{uuid.uuid4().hex[:8]}", "lat": 23.8, "lng": 90.4, "foodType": "biryani"},
+    )
+    if status_code != 201:
+        raise RuntimeError(f"Write failed with status {status_code}")
+
+    written_at = time.monotonic()
+    lags: list[float | None] = [None] * len(replica_urls)
+    deadline = written_at + timeout_seconds
+
+    while None in lags and time.monotonic() < deadline:
+        for index, url in enumerate(replica_urls):
+            if lags[index] is not None:
+                continue
+            _, rows = http_json(f"{url}/api/mosques")
+            if any(row["id"] == entry["id"] for row in rows or []):
+                lags[index] = time.monotonic() - written_at
+        time.sleep(0.02)
+
+    return [lag if lag is not None else float("inf") for lag in lags]
+
+
+def read_worker(urls: list[str], offset: int, duration: float) -> tuple[int, int]:
+    succeeded = 0
+    failed = 0
+    index = offset
+    stop_at = time.monotonic() + duration
+
+    while time.monotonic() < stop_at:
+        status_code, _ = http_json(f"{urls[index % len(urls)]}/api/mosques")
+        if status_code == 200:
+            succeeded += 1
+        else:
+            failed += 1
+        index += 1
+
+    return succeeded, failed
+
+
+def measure_throughput(urls: list[str], duration: float, clients: int) -> tuple[float, int]:
+    with multiprocessing.Pool(clients) as pool:
+        results = pool.starmap(read_worker, [(urls, offset, duration) for offset in range(clients)])
+
+    succeeded = sum(result[0] for result in results)
+    failed = sum(result[1] for result in results)
+    return succeeded / duration, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-replicas", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--server-workers", type=int, default=2)
+    parser.add_argument("--snapshot-interval", type=float, default=1.0)
+    parser.add_argument("--base-port", type=int, default=5100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        primary_url = f"http://127.0.0.1:{args.base_port}"
+        shared_env = {
+            "MOSQUES_DB_PATH": str(Path(work_dir) / "mosques.db"),
+            "SNAPSHOT_DIR": str(Path(work_dir) / "snapshots"),
+            "SNAPSHOT_INTERVAL_SECONDS": str(args.snapshot_interval),
+        }
+
+        processes = [
+            start_server(args.base_port, args.server_workers, {**shared_env, "APP_ROLE": "primary"})
+        ]
+        try:
+            wait_until_ready(primary_url)
+            processes.append(start_publisher({**shared_env, "APP_ROLE": "primary"}))
+
+            for _ in range(20):
+                http_json(
+                    f"{primary_url}/api/mosques",
+                    {"name": "seed", "lat": 23.8, "lng": 90.4, "foodType": "muri"},
+                )
+
+            replica_urls: list[str] = []
+            print("replicas  reads/sec  failures  lag_min_s  lag_max_s")
+
+            throughput, failures = measure_throughput([primary_url], args.duration, args.clients)
+            print(f"{0:8d}  {throughput:9.1f}  {failures:8d}  {'-':>9}  {'-':>9}")
+
+            for count in range(1, args.max_replicas + 1):
+                port = args.base_port + count
+                processes.append(
+                    start_server(
+                        port,
+                        args.server_workers,
+                        {**shared_env, "APP_ROLE": "replica", "PRIMARY_URL": primary_url},
+                    )
+                )
+                replica_urls.append(f"http://127.0.0.1:{port}")
+                wait_until_ready(replica_urls[-1])
+
+                lags = measure_lag(replica_urls[0], replica_urls)
+                throughput, failures = measure_throughput(
+                    replica_urls, args.duration, args.clients
+                )
+                print(
+                    f"{count:8d}  {throughput:9.1f}  {failures:8d}  "
+                    f"{min(lags):9.3f}  {max(lags):9.3f}"
+                )
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()